@@ -0,0 +1,150 @@
+"""
+Self-contained checks for the streaming JSON scanner and the Ollama call path
+(no Ollama needed; the HTTP side uses httpx.MockTransport):
+    python check_json_stream.py
+"""
+import asyncio
+import json
+
+import httpx
+
+from json_stream import JsonStreamScanner
+from ollama_json import call_ollama_json
+
+
+def check(name, actual, expected):
+    # explicit failure instead of assert, so "python -O" cannot skip the checks
+    if actual != expected:
+        raise SystemExit(f"FAIL {name}: expected {expected!r}, got {actual!r}")
+
+
+def run(chunks, expect=None):
+    scanner = JsonStreamScanner(expect)
+    for i, chunk in enumerate(chunks):
+        found, value = scanner.feed(chunk)
+        if found:
+            return i, value
+    return None, None
+
+
+def check_scanner():
+    obj = '{"title": "A {weird} [title]", "quote": "say \\"hi\\" \\\\", "authors": ["A", "B"]}'
+    expected = {"title": "A {weird} [title]", "quote": 'say "hi" \\', "authors": ["A", "B"]}
+
+    # whole response in one chunk, and one character per chunk (every boundary)
+    check("single chunk", run([obj]), (0, expected))
+    check("char chunks", run(list(obj)), (len(obj) - 1, expected))
+
+    # stops at the closing brace, before trailing rambling arrives
+    check("early stop", run([obj, " Hope this helps! {"]), (0, expected))
+
+    # prose before the JSON, including citations and non-JSON brackets
+    check("prose first", run(["Based on [1] and [2, 3] (see [Fig. 2]), here: ", obj], expect=dict), (1, expected))
+
+    # a list when an object is expected is skipped, and so is an object when a list is expected
+    check("skip list", run(['["x"] then ', obj], expect=dict), (1, expected))
+    check("skip object", run(['{"a": 1} then ', '["title", "authors[]"]'], expect=list), (1, ["title", "authors[]"]))
+
+    # truncated output never reports a value
+    check("truncated", run([obj[:-1]]), (None, None))
+    check("unterminated string", run(['{"title": "unterminated']), (None, None))
+
+    # malformed outer value: never return a fragment found inside it
+    check("nested fragment", run(['{"title": "X", "doi": None, "stats": {"n": 5}}'], expect=dict), (None, None))
+    check("brackets in string", run(['["title", "authors[]",]'], expect=list), (None, None))
+
+
+def ndjson(key, text, done=True):
+    lines = [json.dumps({"response": ch} if key == "response" else {"message": {"content": ch}}) for ch in text]
+    if done:
+        lines.append(json.dumps({"done": True}))
+    return [line + "\n" for line in lines]
+
+
+def ollama(handler, **kwargs):
+    return asyncio.run(call_ollama_json("m", "p", transport=httpx.MockTransport(handler), **kwargs))
+
+
+def ollama_error(handler, **kwargs):
+    try:
+        ollama(handler, **kwargs)
+    except Exception as e:
+        return str(e)
+    return None
+
+
+def check_ollama():
+    answer = '{"title": "T"}'
+
+    # /api/generate unavailable (404) -> falls back to /api/chat
+    calls = []
+
+    def not_found(request):
+        calls.append(request.url.path)
+        if request.url.path == "/api/generate":
+            return httpx.Response(404)
+        return httpx.Response(200, content="".join(ndjson("message", "Based on [1]: " + answer)))
+
+    check("404 fallback value", ollama(not_found, expect=dict), {"title": "T"})
+    check("404 fallback calls", calls, ["/api/generate", "/api/chat"])
+
+    # /api/generate produced no text -> falls back to /api/chat
+    calls = []
+
+    def empty(request):
+        calls.append(request.url.path)
+        if request.url.path == "/api/generate":
+            return httpx.Response(200, content="".join(ndjson("response", "")))
+        return httpx.Response(200, content="".join(ndjson("message", answer)))
+
+    check("empty fallback value", ollama(empty, expect=dict), {"title": "T"})
+    check("empty fallback calls", calls, ["/api/generate", "/api/chat"])
+
+    # error after text has started -> raised, no restart on /api/chat
+    calls = []
+
+    def mid_stream_error(request):
+        calls.append(request.url.path)
+        lines = ndjson("response", '{"title": ', done=False) + [json.dumps({"error": "boom"}) + "\n"]
+        return httpx.Response(200, content="".join(lines))
+
+    check("mid-stream error", ollama_error(mid_stream_error, expect=dict), "Ollama error: boom")
+    check("mid-stream error calls", calls, ["/api/generate"])
+
+    # stops reading once the expected value closes, before the rest of the stream / done
+    sent = []
+
+    def early_stop(request):
+        async def body():
+            for line in ndjson("response", answer + " Let me explain the fields."):
+                sent.append(line)
+                yield line.encode()
+
+        return httpx.Response(200, content=body())
+
+    check("early stop value", ollama(early_stop, expect=dict), {"title": "T"})
+    check("early stop before done", any('"done"' in line for line in sent), False)
+
+    # stream=False sends a blocking request and still skips citations
+    def blocking(request):
+        check("blocking payload", json.loads(request.content)["stream"], False)
+        return httpx.Response(200, json={"response": 'See [3]. ["title", "doi"]'})
+
+    check("blocking value", ollama(blocking, stream=False, expect=list), ["title", "doi"])
+
+    # malformed JSON -> error from the end-of-stream fallback, not a nested fragment
+    def malformed(request):
+        return httpx.Response(200, content="".join(ndjson("response", '{"title": "X", "doi": None, "stats": {"n": 5}}')))
+
+    error = ollama_error(malformed, expect=dict) or ""
+    check("malformed error", error.startswith("Could not parse JSON from Ollama"), True)
+
+
+def main():
+    check_scanner()
+    check_ollama()
+    print("json_stream checks passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import json
+from typing import Any, Optional, Tuple
+
+
+def _looks_like_citation(value: Any) -> bool:
+    # "[1]", "[2, 5]" in prose (paper text is full of these) are valid JSON but never an answer
+    return isinstance(value, list) and bool(value) and all(
+        isinstance(x, (int, float)) and not isinstance(x, bool) for x in value
+    )
+
+
+class JsonStreamScanner:
+    """
+    Tracks JSON nesting across streamed text chunks.
+    feed() returns (True, value) once a top-level object/array closes, parses and has the
+    expected shape (expect=dict or list; None accepts either). Anything else is skipped and
+    scanning continues, so prose before the real JSON does not end the stream early.
+    """
+
+    def __init__(self, expect: Optional[type] = None) -> None:
+        self.expect = expect
+        self.text = ""
+        self.start = -1
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self._pos = 0
+
+    def _accept(self, value: Any) -> bool:
+        if _looks_like_citation(value):
+            return False
+        if self.expect is None:
+            return isinstance(value, (dict, list))
+        return isinstance(value, self.expect)
+
+    def feed(self, chunk: str) -> Tuple[bool, Any]:
+        self.text += chunk
+        while self._pos < len(self.text):
+            i = self._pos
+            ch = self.text[i]
+            self._pos += 1
+
+            if self.start == -1:
+                if ch in "{[":
+                    self.start, self.depth = i, 1
+                continue
+
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif ch == "\\":
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+                continue
+
+            if ch == '"':
+                self.in_string = True
+            elif ch in "{[":
+                self.depth += 1
+            elif ch in "}]":
+                self.depth -= 1
+                if self.depth == 0:
+                    start, self.start = self.start, -1
+                    try:
+                        value = json.loads(self.text[start:i + 1])
+                    except Exception:
+                        # not JSON: prose like "[see Fig. 2]", or near-JSON such as None / trailing
+                        # commas. Skip the whole run; never return a fragment from inside it
+                        # (the caller's end-of-stream fallback reports broken JSON).
+                        continue
+                    if self._accept(value):
+                        return True, value
+                    # valid JSON of the wrong shape (citation, list when an object is expected):
+                    # skip it too and keep scanning after it
+        return False, None
@@ -0,0 +1,113 @@
+import json
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+from json_stream import JsonStreamScanner
+
+OLLAMA_BASE = "http://127.0.0.1:11434"
+
+
+def _extract_json_from_text(text: str) -> Any:
+    # Extract first JSON array or object from response
+    s_obj, e_obj = text.find("{"), text.rfind("}")
+    s_arr, e_arr = text.find("["), text.rfind("]")
+
+    candidate = None
+    if s_arr != -1 and e_arr != -1 and e_arr > s_arr:
+        candidate = text[s_arr:e_arr + 1]
+    elif s_obj != -1 and e_obj != -1 and e_obj > s_obj:
+        candidate = text[s_obj:e_obj + 1]
+
+    if not candidate:
+        raise ValueError("Ollama did not return JSON. First 400 chars: " + text[:400])
+
+    try:
+        return json.loads(candidate)
+    except Exception as e:
+        raise ValueError(f"Could not parse JSON from Ollama: {e}. First 400 chars: {text[:400]}")
+
+
+def _ollama_chunk_text(data: Dict[str, Any]) -> str:
+    # /api/chat puts text in message.content, /api/generate in response
+    if "message" in data:
+        return (data.get("message") or {}).get("content") or ""
+    return data.get("response") or ""
+
+
+async def _ollama_request(
+    client: httpx.AsyncClient,
+    url: str,
+    payload: Dict[str, Any],
+    stream: bool,
+    scanner: JsonStreamScanner,
+) -> Tuple[bool, Any]:
+    """
+    Send one Ollama request and feed its text into scanner; returns scanner's (found, value).
+    When streaming, leaving the response as soon as the expected JSON value has closed
+    drops the connection, which makes Ollama stop generating instead of finishing the ramble.
+    """
+    if not stream:
+        r = await client.post(url, json={**payload, "stream": False})
+        r.raise_for_status()
+        return scanner.feed(_ollama_chunk_text(r.json()))
+
+    async with client.stream("POST", url, json={**payload, "stream": True}) as r:
+        r.raise_for_status()
+        async for line in r.aiter_lines():
+            if not line.strip():
+                continue
+            data = json.loads(line)
+            if data.get("error"):
+                raise ValueError(f"Ollama error: {data['error']}")
+            chunk = _ollama_chunk_text(data)
+            if chunk:
+                found, value = scanner.feed(chunk)
+                if found:
+                    return True, value
+            if data.get("done"):
+                break
+    return False, None
+
+
+async def call_ollama_json(
+    model: str,
+    prompt: str,
+    stream: bool = True,
+    expect: Optional[type] = None,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> Any:
+    """
+    Ask Ollama for JSON (expect=dict/list picks the top-level shape to accept).
+    With stream=True, generation is cancelled once that value has been received.
+    transport lets callers swap the HTTP layer (e.g. httpx.MockTransport in checks).
+    """
+    base = OLLAMA_BASE
+    options = {"temperature": 0}
+    # Try /api/generate, fallback /api/chat
+    endpoints = [
+        (f"{base}/api/generate", {"model": model, "prompt": prompt, "options": options}),
+        (
+            f"{base}/api/chat",
+            {"model": model, "messages": [{"role": "user", "content": prompt}], "options": options},
+        ),
+    ]
+
+    text = ""
+    async with httpx.AsyncClient(timeout=180, transport=transport) as client:
+        for i, (url, payload) in enumerate(endpoints):
+            scanner = JsonStreamScanner(expect)
+            try:
+                found, value = await _ollama_request(client, url, payload, stream, scanner)
+            except Exception:
+                # only fall back if this endpoint failed before producing any text
+                if i == len(endpoints) - 1 or scanner.text:
+                    raise
+                continue
+            if found:
+                return value
+            text = scanner.text.strip()
+            if text:
+                break
+
+    return _extract_json_from_text(text)
@@ -8,6 +8,8 @@ from fastapi import FastAPI, UploadFile, File, Form, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from jsonschema import Draft202012Validator
 
+from ollama_json import call_ollama_json
+
 app = FastAPI(title="Tiny Paper Extractor (Heuristics + Ollama LLM)")
 
 app.add_middleware(
@@ -168,67 +170,11 @@ def _coerce_llm_output_to_object(schema: Dict[str, Any], llm_obj: Any) -> Dict[s
     raise ValueError(f"LLM returned {type(llm_obj)} but schema expects an object.")
 
 
-async def call_ollama_json(model: str, prompt: str) -> Any:
-    base = "http://127.0.0.1:11434"
-
-    async with httpx.AsyncClient(timeout=180) as client:
-        text = None
-
-        # Try /api/generate
-        try:
-            r = await client.post(
-                f"{base}/api/generate",
-                json={
-                    "model": model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {"temperature": 0},
-                },
-            )
-            r.raise_for_status()
-            data = r.json()
-            text = (data.get("response") or "").strip()
-        except Exception:
-            pass
-
-        # Fallback /api/chat
-        if not text:
-            r = await client.post(
-                f"{base}/api/chat",
-                json={
-                    "model": model,
-                    "messages": [{"role": "user", "content": prompt}],
-                    "stream": False,
-                    "options": {"temperature": 0},
-                },
-            )
-            r.raise_for_status()
-            data = r.json()
-            text = (data.get("message", {}) or {}).get("content", "").strip()
-
-    # Extract first JSON array or object from response
-    s_obj, e_obj = text.find("{"), text.rfind("}")
-    s_arr, e_arr = text.find("["), text.rfind("]")
-
-    candidate = None
-    if s_arr != -1 and e_arr != -1 and e_arr > s_arr:
-        candidate = text[s_arr:e_arr + 1]
-    elif s_obj != -1 and e_obj != -1 and e_obj > s_obj:
-        candidate = text[s_obj:e_obj + 1]
-
-    if not candidate:
-        raise ValueError("Ollama did not return JSON. First 400 chars: " + text[:400])
-
-    try:
-        return json.loads(candidate)
-    except Exception as e:
-        raise ValueError(f"Could not parse JSON from Ollama: {e}. First 400 chars: {text[:400]}")
-
-
 @app.post("/schema_from_prompt")
 async def schema_from_prompt(
     user_request: str = Form(...),
     llm_model: str = Form(default="llama3:latest"),
+    llm_stream: bool = Form(default=True),
 ):
     prompt = f"""
 Convert the user's request into a CLEAN field list for information extraction from academic papers.
@@ -246,7 +192,7 @@ User request:
 """.strip()
 
     try:
-        obj = await call_ollama_json(llm_model, prompt)
+        obj = await call_ollama_json(llm_model, prompt, stream=llm_stream, expect=list)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"LLM field generation failed: {e}")
 
@@ -283,6 +229,7 @@ async def extract(
     llm_enabled: bool = Form(default=False),
     llm_model: str = Form(default="llama3:latest"),
     llm_pages: int = Form(default=1),
+    llm_stream: bool = Form(default=True),
 ):
     # Parse schema
     try:
@@ -371,7 +318,7 @@ Paper text (may be truncated; includes page markers):
 {llm_text}
 """.strip()
 
-            raw_llm = await call_ollama_json(llm_model, llm_prompt)
+            raw_llm = await call_ollama_json(llm_model, llm_prompt, stream=llm_stream, expect=dict)
             extracted_json_llm = _coerce_llm_output_to_object(schema, raw_llm)
             mode_used = "llm"
         except Exception as e:
@@ -416,6 +363,7 @@ Paper text (may be truncated; includes page markers):
             "llm_enabled": llm_enabled,
             "llm_model": llm_model,
             "llm_pages_used": int(llm_pages),
+            "llm_stream": llm_stream,
             "llm_error": llm_error,
             "mode_used": mode_used,
             "merge_policy": "LLM first; then fill missing/nulls from heuristics (evidence-based)",